@@ -1,5 +1,6 @@
 import code
 import contextlib
+import importlib.metadata
 import os
 import pdb
 import runpy
@@ -45,6 +46,8 @@ SUGGEST_ERROR_COMMAND = (
 
 USAGE_ERRORS = (CumulusCIUsageError, click.UsageError)
 
+SKIP_CONFLICT_CHECK_ENV = "CUMULUSCI_SKIP_CONFLICT_CHECK"
+
 # Global variable to track the context stack for cleanup on signal
 _exit_stack = None
 _signal_handler_active = False  # Flag to prevent recursive signal handler calls
@@ -118,6 +121,24 @@ def _signal_handler(signum, frame):
     sys.exit(exit_code)
 
 
+def _check_conflicting_install():
+    """Refuse to run if the legacy cumulusci package is installed alongside us.
+
+    The result is recorded in the environment so that cci subprocesses
+    started by this one can skip the package metadata scan.
+    """
+    if os.environ.get(SKIP_CONFLICT_CHECK_ENV):
+        return
+    try:
+        importlib.metadata.version("cumulusci")
+    except importlib.metadata.PackageNotFoundError:
+        os.environ[SKIP_CONFLICT_CHECK_ENV] = "True"
+        return
+    raise CumulusCIUsageError(
+        "CumulusCI installation found, Remove the CumulusCI package."
+    )
+
+
 #
 # Root command
 #
@@ -149,6 +170,8 @@ def main(args=None):
 
         args = args or sys.argv
 
+        _check_conflicting_install()
+
         # (If enabled) set up requests to validate certs using system CA certs instead of certifi
         init_requests_trust()
 
@@ -1,28 +1,18 @@
-import contextlib
-import io
+import importlib.metadata
 import os
 import signal
-import sys
-from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
 
 import click
 import pytest
-from packaging import version
-from requests.exceptions import ConnectionError
-from rich.console import Console
 
-import cumulusci
 from cumulusci.cli import cci
 from cumulusci.cli.tests.utils import run_click_command
 from cumulusci.cli.utils import get_installed_version
-from cumulusci.core.config import BaseProjectConfig
 from cumulusci.core.exceptions import CumulusCIException
 from cumulusci.utils import temporary_dir
 
-MagicMock = mock.MagicMock()
-CONSOLE = mock.Mock()
-
 
 @pytest.fixture(autouse=True)
 def reset_signal_handler_flag():
@@ -32,201 +22,164 @@ def reset_signal_handler_flag():
     cci._signal_handler_active = False
 
 
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr")
-@mock.patch("cumulusci.cli.cci.get_tempfile_logger")
-@mock.patch("cumulusci.cli.cci.init_logger")
-@mock.patch("cumulusci.cli.cci.check_latest_version")
-@mock.patch("cumulusci.cli.cci.CliRuntime")
-@mock.patch("cumulusci.cli.cci.cli")
-def test_main(
-    cli,
-    CliRuntime,
-    check_latest_version,
-    init_logger,
-    get_tempfile_logger,
-    tee,
-):
-    get_tempfile_logger.return_value = mock.Mock(), "tempfile.log"
+def patch_cci(monkeypatch, *names):
+    """Replace the named cci globals (or builtins it calls) with MagicMocks"""
+    mocks = {name: mock.MagicMock() for name in names}
+    for name, value in mocks.items():
+        monkeypatch.setattr(cci, name, value, raising=hasattr(cci, name))
+    return SimpleNamespace(**mocks)
+
+
+@pytest.fixture
+def cli_runtime_mock():
+    """A CliRuntime instance with the defaults most cci.main() tests expect"""
+    runtime = mock.Mock()
+    runtime.universal_config.cli__show_stacktraces = False
+    runtime.keychain.get_default_org.return_value = (None, None)
+    runtime.get_org.return_value = ("test", mock.Mock())
+    return runtime
+
+
+@pytest.fixture
+def patched_cci_main(monkeypatch, cli_runtime_mock):
+    """Patch the collaborators of cci.main() and yield the mocks by name"""
+    mocks = patch_cci(
+        monkeypatch,
+        "tee_stdout_stderr",
+        "get_tempfile_logger",
+        "init_logger",
+        "check_latest_version",
+        "CliRuntime",
+        "cli",
+    )
+    mocks.CliRuntime.return_value = cli_runtime_mock
+    return mocks
+
+
+def test_main(patched_cci_main):
+    patched_cci_main.get_tempfile_logger.return_value = mock.Mock(), "tempfile.log"
     cci.main()
 
-    check_latest_version.assert_called_once()
-    init_logger.assert_called_once()
-    CliRuntime.assert_called_once()
-    cli.assert_called_once()
-    tee.assert_called_once()
+    patched_cci_main.check_latest_version.assert_called_once()
+    patched_cci_main.init_logger.assert_called_once()
+    patched_cci_main.CliRuntime.assert_called_once()
+    patched_cci_main.cli.assert_called_once()
+    patched_cci_main.tee_stdout_stderr.assert_called_once()
 
 
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr")
-@mock.patch("cumulusci.cli.cci.get_tempfile_logger")
-@mock.patch("cumulusci.cli.cci.init_logger")
-@mock.patch("cumulusci.cli.cci.check_latest_version")
-@mock.patch("cumulusci.cli.cci.CliRuntime")
-@mock.patch("cumulusci.cli.cci.cli")
 @mock.patch("pdb.post_mortem")
 @mock.patch("sys.exit")
-def test_main__debug(
-    sys_exit,
-    post_mortem,
-    cli,
-    CliRuntime,
-    check_latest_version,
-    init_logger,
-    get_tempfile_logger,
-    tee,
-):
-    cli.side_effect = Exception
-    get_tempfile_logger.return_value = (mock.Mock(), "tempfile.log")
+def test_main__debug(sys_exit, post_mortem, patched_cci_main):
+    patched_cci_main.cli.side_effect = Exception
+    patched_cci_main.get_tempfile_logger.return_value = (mock.Mock(), "tempfile.log")
 
     cci.main(["cci", "--debug"])
 
-    check_latest_version.assert_called_once()
-    init_logger.assert_called_once_with(debug=True)
-    CliRuntime.assert_called_once()
-    cli.assert_called_once()
+    patched_cci_main.check_latest_version.assert_called_once()
+    patched_cci_main.init_logger.assert_called_once_with(debug=True)
+    patched_cci_main.CliRuntime.assert_called_once()
+    patched_cci_main.cli.assert_called_once()
     post_mortem.assert_called_once()
     sys_exit.assert_called_once_with(1)
-    get_tempfile_logger.assert_called_once()
-    tee.assert_called_once()
+    patched_cci_main.get_tempfile_logger.assert_called_once()
+    patched_cci_main.tee_stdout_stderr.assert_called_once()
 
 
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr")
-@mock.patch("cumulusci.cli.cci.get_tempfile_logger")
-@mock.patch("cumulusci.cli.cci.init_logger")
-@mock.patch("cumulusci.cli.cci.check_latest_version")
-@mock.patch("cumulusci.cli.cci.CliRuntime")
-@mock.patch("cumulusci.cli.cci.cli")
 @mock.patch("pdb.post_mortem")
 def test_main__cci_show_stacktraces(
-    post_mortem,
-    cli,
-    CliRuntime,
-    check_latest_version,
-    init_logger,
-    get_tempfile_logger,
-    tee,
-    capsys,
+    post_mortem, patched_cci_main, cli_runtime_mock, capsys, tmp_path
 ):
-    runtime = mock.Mock()
-    runtime.universal_config.cli__show_stacktraces = True
-    CliRuntime.return_value = runtime
-    cli.side_effect = Exception
-    get_tempfile_logger.return_value = (mock.Mock(), "tempfile.log")
+    cli_runtime_mock.universal_config.cli__show_stacktraces = True
+    patched_cci_main.cli.side_effect = Exception
+    logfile = str(tmp_path / "tempfile.log")
+    patched_cci_main.get_tempfile_logger.return_value = mock.Mock(), logfile
 
     with pytest.raises(SystemExit):
         cci.main(["cci"])
 
-    check_latest_version.assert_called_once()
-    init_logger.assert_called_once_with(debug=False)
-    CliRuntime.assert_called_once()
-    cli.assert_called_once()
+    patched_cci_main.check_latest_version.assert_called_once()
+    patched_cci_main.init_logger.assert_called_once_with(debug=False)
+    patched_cci_main.CliRuntime.assert_called_once()
+    patched_cci_main.cli.assert_called_once()
     post_mortem.assert_not_called()
     captured = capsys.readouterr()
     assert "Traceback (most recent call last)" in captured.err
 
 
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr")
-@mock.patch("cumulusci.cli.cci.get_tempfile_logger")
-@mock.patch("cumulusci.cli.cci.init_logger")
-@mock.patch("cumulusci.cli.cci.cli")
 @mock.patch("sys.exit")
-def test_main__abort(
-    sys_exit, cli, init_logger, get_tempfile_logger, tee_stdout_stderr
-):
-    get_tempfile_logger.return_value = (mock.Mock(), "tempfile.log")
-    cli.side_effect = click.Abort
+def test_main__abort(sys_exit, patched_cci_main):
+    patched_cci_main.get_tempfile_logger.return_value = (mock.Mock(), "tempfile.log")
+    patched_cci_main.cli.side_effect = click.Abort
     cci.main(["cci"])
-    cli.assert_called_once()
+    patched_cci_main.cli.assert_called_once()
     sys_exit.assert_called_once_with(1)
 
 
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr")
-@mock.patch("cumulusci.cli.cci.get_tempfile_logger")
-@mock.patch("cumulusci.cli.cci.init_logger")
-@mock.patch("cumulusci.cli.cci.check_latest_version")
-@mock.patch("cumulusci.cli.cci.CliRuntime")
-@mock.patch("cumulusci.cli.cci.cli")
 @mock.patch("pdb.post_mortem")
 @mock.patch("sys.exit")
-def test_main__error(
-    sys_exit,
-    post_mortem,
-    cli,
-    CliRuntime,
-    check_latest_version,
-    init_logger,
-    get_tempfile_logger,
-    tee,
-):
-    runtime = mock.Mock()
-    runtime.universal_config.cli__show_stacktraces = False
-    CliRuntime.return_value = runtime
-
-    cli.side_effect = Exception
-    get_tempfile_logger.return_value = mock.Mock(), "tempfile.log"
+def test_main__error(sys_exit, post_mortem, patched_cci_main, tmp_path):
+    patched_cci_main.cli.side_effect = Exception
+    logfile = str(tmp_path / "tempfile.log")
+    patched_cci_main.get_tempfile_logger.return_value = mock.Mock(), logfile
 
     cci.main(["cci", "org", "info"])
 
-    check_latest_version.assert_called_once()
-    init_logger.assert_called_once_with(debug=False)
-    CliRuntime.assert_called_once()
-    cli.assert_called_once()
+    patched_cci_main.check_latest_version.assert_called_once()
+    patched_cci_main.init_logger.assert_called_once_with(debug=False)
+    patched_cci_main.CliRuntime.assert_called_once()
+    patched_cci_main.cli.assert_called_once()
     post_mortem.call_count == 0
     sys_exit.assert_called_once_with(1)
-    get_tempfile_logger.assert_called_once()
-    tee.assert_called_once()
-
-    os.remove("tempfile.log")
-
+    patched_cci_main.get_tempfile_logger.assert_called_once()
+    patched_cci_main.tee_stdout_stderr.assert_called_once()
 
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr")
-@mock.patch("cumulusci.cli.cci.get_tempfile_logger")
-@mock.patch("cumulusci.cli.cci.CliRuntime")
-def test_main__CliRuntime_error(CliRuntime, get_tempfile_logger, tee):
-    CliRuntime.side_effect = CumulusCIException("something happened")
-    get_tempfile_logger.return_value = mock.Mock(), "tempfile.log"
 
-    with contextlib.redirect_stderr(io.StringIO()) as stderr:
-        with mock.patch("sys.exit") as sys_exit:
-            sys_exit.side_effect = SystemExit  # emulate real sys.exit
-            with pytest.raises(SystemExit):
-                cci.main(["cci", "org", "info"])
+def test_main__CliRuntime_error(patched_cci_main, tmp_path, capsys):
+    patched_cci_main.CliRuntime.side_effect = CumulusCIException("something happened")
+    logfile = str(tmp_path / "tempfile.log")
+    patched_cci_main.get_tempfile_logger.return_value = mock.Mock(), logfile
 
-    assert "something happened" in stderr.getvalue()
+    with mock.patch("sys.exit") as sys_exit:
+        sys_exit.side_effect = SystemExit  # emulate real sys.exit
+        with pytest.raises(SystemExit):
+            cci.main(["cci", "org", "info"])
 
-    tempfile = Path("tempfile.log")
-    tempfile.unlink()
+    assert "something happened" in capsys.readouterr().err
 
 
 @mock.patch("cumulusci.cli.cci.init_logger")  # side effects break other tests
 @mock.patch("cumulusci.cli.cci.get_tempfile_logger")
 @mock.patch("cumulusci.cli.cci.tee_stdout_stderr")
 @mock.patch("cumulusci.cli.cci.CliRuntime")
-@mock.patch("sys.exit", MagicMock())
+@mock.patch("sys.exit", new_callable=mock.MagicMock)
 def test_handle_org_name(
-    CliRuntime, tee_stdout_stderr, get_tempfile_logger, init_logger
+    sys_exit,
+    CliRuntime,
+    tee_stdout_stderr,
+    get_tempfile_logger,
+    init_logger,
+    cli_runtime_mock,
+    capsys,
 ):
+    CliRuntime.return_value = cli_runtime_mock
 
     # get_tempfile_logger doesn't clean up after itself which breaks other tests
     get_tempfile_logger.return_value = mock.Mock(), ""
 
-    with contextlib.redirect_stdout(io.StringIO()) as stdout:
-        cci.main(["cci", "org", "default", "xyzzy"])
-    assert "xyzzy is now the default org" in stdout.getvalue()
+    cci.main(["cci", "org", "default", "xyzzy"])
+    assert "xyzzy is now the default org" in capsys.readouterr().out
 
-    with contextlib.redirect_stdout(io.StringIO()) as stdout:
-        cci.main(["cci", "org", "default", "--org", "xyzzy2"])
-    assert "xyzzy2 is now the default org" in stdout.getvalue()
+    cci.main(["cci", "org", "default", "--org", "xyzzy2"])
+    assert "xyzzy2 is now the default org" in capsys.readouterr().out
 
-    with contextlib.redirect_stderr(io.StringIO()) as stderr:
-        cci.main(["cci", "org", "default", "xyzzy1", "--org", "xyzzy2"])
-    assert "not both" in stderr.getvalue()
+    cci.main(["cci", "org", "default", "xyzzy1", "--org", "xyzzy2"])
+    assert "not both" in capsys.readouterr().err
 
-    CliRuntime().keychain.get_default_org.return_value = ("xyzzy3", None)
+    cli_runtime_mock.keychain.get_default_org.return_value = ("xyzzy3", None)
 
     # cci org remove should really need an attached org
-    with contextlib.redirect_stderr(io.StringIO()) as stderr:
-        cci.main(["cci", "org", "remove"])
-    assert "Please specify ORGNAME or --org ORGNAME" in stderr.getvalue()
+    cci.main(["cci", "org", "remove"])
+    assert "Please specify ORGNAME or --org ORGNAME" in capsys.readouterr().err
 
 
 @mock.patch("cumulusci.cli.cci.init_logger")  # side effects break other tests
@@ -235,23 +188,28 @@ def test_handle_org_name(
 @mock.patch("sys.exit")
 @mock.patch("cumulusci.cli.cci.CliRuntime")
 def test_cci_org_default__no_orgname(
-    CliRuntime, exit, tee_stdout_stderr, get_tempfile_logger, init_logger
+    CliRuntime,
+    exit,
+    tee_stdout_stderr,
+    get_tempfile_logger,
+    init_logger,
+    cli_runtime_mock,
+    capsys,
 ):
+    CliRuntime.return_value = cli_runtime_mock
     # get_tempfile_logger doesn't clean up after itself which breaks other tests
     get_tempfile_logger.return_value = mock.Mock(), ""
 
-    CliRuntime().keychain.get_default_org.return_value = ("xyzzy4", None)
-    with contextlib.redirect_stdout(io.StringIO()) as stdout:
-        cci.main(["cci", "org", "default"])
-    assert "xyzzy4 is the default org" in stdout.getvalue()
+    cli_runtime_mock.keychain.get_default_org.return_value = ("xyzzy4", None)
+    cci.main(["cci", "org", "default"])
+    assert "xyzzy4 is the default org" in capsys.readouterr().out
 
-    CliRuntime().keychain.get_default_org.return_value = (None, None)
-    with contextlib.redirect_stdout(io.StringIO()) as stdout:
-        cci.main(["cci", "org", "default"])
-    assert "There is no default org" in stdout.getvalue()
+    cli_runtime_mock.keychain.get_default_org.return_value = (None, None)
+    cci.main(["cci", "org", "default"])
+    assert "There is no default org" in capsys.readouterr().out
 
 
-DEPLOY_CLASS_PATH = f"cumulusci.tasks.salesforce.Deploy{'.Deploy' if sys.version_info >= (3, 11) else ''}"
+DEPLOY_CLASS_PATH = "cumulusci.tasks.salesforce.Deploy.Deploy"
 
 
 @mock.patch(
@@ -267,19 +225,19 @@ def test_cci_run_task_options__with_dash(
     Deploy,
     CliRuntime,
     get_tempfile_logger,
+    cli_runtime_mock,
 ):
+    from cumulusci.core.config import BaseProjectConfig, TaskConfig
+
     # get_tempfile_logger doesn't clean up after itself which breaks other tests
     Deploy.return_value = None
     get_tempfile_logger.return_value = mock.Mock(), ""
-    CliRuntime.return_value = runtime = mock.Mock()
-    runtime.get_org.return_value = ("test", mock.Mock())
-    runtime.project_config = BaseProjectConfig(
-        runtime.universal_config,
-        {
-            "project": {"name": "Test"},
-            "tasks": {"deploy": {"class_path": "cumulusci.tasks.salesforce.Deploy"}},
-        },
+    CliRuntime.return_value = cli_runtime_mock
+    cli_runtime_mock.project_config = project_config = mock.Mock(spec=BaseProjectConfig)
+    project_config.get_task.return_value = task_config = TaskConfig(
+        {"class_path": "cumulusci.tasks.salesforce.Deploy"}
     )
+    task_config.project_config = project_config
 
     cci.main(
         ["cci", "task", "run", "deploy", "--path", "x", "--clean-meta-xml", "False"]
@@ -299,19 +257,19 @@ def test_cci_run_task_options__old_style_with_dash(
     Deploy,
     CliRuntime,
     get_tempfile_logger,
+    cli_runtime_mock,
 ):
+    from cumulusci.core.config import BaseProjectConfig, TaskConfig
+
     # get_tempfile_logger doesn't clean up after itself which breaks other tests
     Deploy.return_value = None
     get_tempfile_logger.return_value = mock.Mock(), ""
-    CliRuntime.return_value = runtime = mock.Mock()
-    runtime.get_org.return_value = ("test", mock.Mock())
-    runtime.project_config = BaseProjectConfig(
-        runtime.universal_config,
-        {
-            "project": {"name": "Test"},
-            "tasks": {"deploy": {"class_path": "cumulusci.tasks.salesforce.Deploy"}},
-        },
+    CliRuntime.return_value = cli_runtime_mock
+    cli_runtime_mock.project_config = project_config = mock.Mock(spec=BaseProjectConfig)
+    project_config.get_task.return_value = task_config = TaskConfig(
+        {"class_path": "cumulusci.tasks.salesforce.Deploy"}
     )
+    task_config.project_config = project_config
 
     cci.main(
         [
@@ -330,59 +288,54 @@ def test_cci_run_task_options__old_style_with_dash(
     assert "clean_meta_xml" in task_config.options
 
 
-@mock.patch("cumulusci.cli.cci.open")
-@mock.patch("cumulusci.cli.cci.traceback")
-def test_handle_exception(traceback, cci_open):
+def test_handle_exception(monkeypatch, capsys):
+    from rich.console import Console
+
+    mocks = patch_cci(monkeypatch, "open", "traceback")
     console = mock.Mock()
     Console.return_value = console
     error_message = "foo"
-    cci_open.__enter__.return_value = mock.Mock()
 
-    with contextlib.redirect_stderr(io.StringIO()) as stderr:
-        cci.handle_exception(error_message, False, "logfile.path")
+    cci.handle_exception(error_message, False, "logfile.path")
 
-    stderr = stderr.getvalue()
+    stderr = capsys.readouterr().err
     assert f"Error: {error_message}" in stderr
     assert cci.SUGGEST_ERROR_COMMAND in stderr
-    traceback.print_exc.assert_called_once()
+    mocks.traceback.print_exc.assert_called_once()
 
 
-@mock.patch("cumulusci.cli.cci.open")
-def test_handle_exception__error_cmd(cci_open):
+def test_handle_exception__error_cmd(monkeypatch, capsys):
     """Ensure we don't write to logfiles when running `cci error ...` commands."""
+    mocks = patch_cci(monkeypatch, "open")
     error_message = "foo"
     logfile_path = None
 
-    with contextlib.redirect_stderr(io.StringIO()) as stderr:
-        cci.handle_exception(error_message, False, logfile_path)
+    cci.handle_exception(error_message, False, logfile_path)
 
-    stderr = stderr.getvalue()
+    stderr = capsys.readouterr().err
     assert f"Error: {error_message}" in stderr
     assert cci.SUGGEST_ERROR_COMMAND in stderr
-    cci_open.assert_not_called()
+    mocks.open.assert_not_called()
 
 
-@mock.patch("cumulusci.cli.cci.open")
-@mock.patch("cumulusci.cli.cci.traceback")
-def test_handle_click_exception(traceback, cci_open):
-    cci_open.__enter__.return_value = mock.Mock()
+def test_handle_click_exception(monkeypatch, capsys):
+    mocks = patch_cci(monkeypatch, "open", "traceback")
 
-    with contextlib.redirect_stderr(io.StringIO()) as stderr:
-        cci.handle_exception(click.ClickException("[oops]"), False, "file.path")
+    cci.handle_exception(click.ClickException("[oops]"), False, "file.path")
 
-    stderr = stderr.getvalue()
+    stderr = capsys.readouterr().err
     assert "Error: [oops]" in stderr
-    traceback.assert_not_called()
+    mocks.traceback.assert_not_called()
 
 
-@mock.patch("cumulusci.cli.cci.open")
-def test_handle_connection_exception(cci_open):
-    cci_open.__enter__.return_value = mock.Mock()
+def test_handle_connection_exception(monkeypatch, capsys):
+    from requests.exceptions import ConnectionError
 
-    with contextlib.redirect_stderr(io.StringIO()) as stderr:
-        cci.handle_exception(ConnectionError(), False, "file.log")
+    patch_cci(monkeypatch, "open")
 
-    stderr = stderr.getvalue()
+    cci.handle_exception(ConnectionError(), False, "file.log")
+
+    stderr = capsys.readouterr().err
     assert "We encountered an error with your internet connection." in stderr
 
 
@@ -390,32 +343,34 @@ def test_cli():
     run_click_command(cci.cli)
 
 
-@mock.patch(
-    "cumulusci.cli.cci.get_latest_final_version",
-    mock.Mock(return_value=version.parse("100")),
-)
-def test_version(capsys):
+def test_version(monkeypatch, capsys):
+    from packaging import version
+
+    from cumulusci import __version__
+
+    mocks = patch_cci(monkeypatch, "get_latest_final_version")
+    mocks.get_latest_final_version.return_value = version.parse("100")
     run_click_command(cci.version)
     console_output = capsys.readouterr().out
-    assert f"CumulusCI Plus version: {cumulusci.__version__}" in console_output
+    assert f"CumulusCI Plus version: {__version__}" in console_output
     assert "There is a newer version of CumulusCI Plus available" in console_output
 
 
-@mock.patch(
-    "cumulusci.cli.cci.get_latest_final_version",
-    mock.Mock(return_value=version.parse("1")),
-)
-def test_version__latest(capsys):
+def test_version__latest(monkeypatch, capsys):
+    from packaging import version
+
+    mocks = patch_cci(monkeypatch, "get_latest_final_version")
+    mocks.get_latest_final_version.return_value = version.parse("1")
     run_click_command(cci.version)
     console_output = capsys.readouterr().out
     assert "You have the latest version of CumulusCI" in console_output
 
 
-@mock.patch("cumulusci.cli.cci.warn_if_no_long_paths")
-@mock.patch("cumulusci.cli.cci.get_latest_final_version", get_installed_version)
-def test_version__win_path_warning(warn_if):
+def test_version__win_path_warning(monkeypatch):
+    mocks = patch_cci(monkeypatch, "warn_if_no_long_paths")
+    monkeypatch.setattr(cci, "get_latest_final_version", get_installed_version)
     run_click_command(cci.version)
-    warn_if.assert_called_once()
+    mocks.warn_if_no_long_paths.assert_called_once()
 
 
 @mock.patch("code.interact")
@@ -441,8 +396,8 @@ def test_shell_code(print):
     print.assert_called_once()
 
 
-@mock.patch("cumulusci.cli.cci.print")
-def test_shell_mutually_exclusive_args(print):
+def test_shell_mutually_exclusive_args(monkeypatch):
+    patch_cci(monkeypatch, "print")
     with pytest.raises(Exception) as e:
         run_click_command(cci.shell, script="foo.py", python="print(config, runtime)")
     assert "Cannot specify both" in e.value.message
@@ -466,12 +421,12 @@ def test_cover_command_groups():
 
 @mock.patch(
     "cumulusci.cli.runtime.CliRuntime.get_org",
-    lambda *args, **kwargs: (MagicMock(), MagicMock()),
+    lambda *args, **kwargs: (mock.MagicMock(), mock.MagicMock()),
 )
-@mock.patch("cumulusci.core.runtime.BaseCumulusCI._load_keychain", MagicMock())
-@mock.patch("pdb.post_mortem", MagicMock())
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr", MagicMock())
-@mock.patch("cumulusci.cli.cci.init_logger", MagicMock())
+@mock.patch("cumulusci.core.runtime.BaseCumulusCI._load_keychain", mock.MagicMock())
+@mock.patch("pdb.post_mortem", mock.MagicMock())
+@mock.patch("cumulusci.cli.cci.tee_stdout_stderr", mock.MagicMock())
+@mock.patch("cumulusci.cli.cci.init_logger", mock.MagicMock())
 @mock.patch("cumulusci.cli.cci.get_tempfile_logger")
 def test_run_task_debug(get_tempfile_logger):
     get_tempfile_logger.return_value = (mock.Mock(), "tempfile.log")
@@ -485,13 +440,13 @@ def test_run_task_debug(get_tempfile_logger):
 
 @mock.patch(
     "cumulusci.cli.runtime.CliRuntime.get_org",
-    lambda *args, **kwargs: (MagicMock(), MagicMock()),
+    lambda *args, **kwargs: (mock.MagicMock(), mock.MagicMock()),
 )
-@mock.patch("cumulusci.core.runtime.BaseCumulusCI._load_keychain", MagicMock())
-@mock.patch("pdb.post_mortem", MagicMock())
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr", MagicMock())
-@mock.patch("cumulusci.cli.cci.init_logger", MagicMock())
-@mock.patch("cumulusci.tasks.robotframework.RobotLibDoc", MagicMock())
+@mock.patch("cumulusci.core.runtime.BaseCumulusCI._load_keychain", mock.MagicMock())
+@mock.patch("pdb.post_mortem", mock.MagicMock())
+@mock.patch("cumulusci.cli.cci.tee_stdout_stderr", mock.MagicMock())
+@mock.patch("cumulusci.cli.cci.init_logger", mock.MagicMock())
+@mock.patch("cumulusci.tasks.robotframework.RobotLibDoc", mock.MagicMock())
 @mock.patch("cumulusci.cli.cci.get_tempfile_logger")
 def test_run_flow_debug(get_tempfile_logger):
     get_tempfile_logger.return_value = (mock.Mock(), "tempfile.log")
@@ -510,21 +465,18 @@ def mock_validate_debug(value):
     return _run_task
 
 
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr")
-@mock.patch("cumulusci.cli.cci.get_tempfile_logger")
-@mock.patch("cumulusci.cli.cci.init_logger")
-@mock.patch("cumulusci.cli.cci.check_latest_version")
-@mock.patch("cumulusci.cli.cci.CliRuntime")
-@mock.patch("cumulusci.cli.cci.show_version_info")
-def test_dash_dash_version(
-    show_version_info,
-    CliRuntime,
-    check_latest_version,
-    init_logger,
-    get_tempfile_logger,
-    tee,
-):
-    get_tempfile_logger.return_value = mock.Mock(), "tempfile.log"
+def test_dash_dash_version(monkeypatch):
+    mocks = patch_cci(
+        monkeypatch,
+        "tee_stdout_stderr",
+        "get_tempfile_logger",
+        "init_logger",
+        "check_latest_version",
+        "CliRuntime",
+        "show_version_info",
+    )
+    show_version_info = mocks.show_version_info
+    mocks.get_tempfile_logger.return_value = mock.Mock(), "tempfile.log"
     cci.main(["cci", "--help"])
     assert len(show_version_info.mock_calls) == 0
 
@@ -550,34 +502,32 @@ def test_signal_handler_terminates_process_group(
     # Mock the global exit stack
     mock_exit_stack = mock.Mock()
     with mock.patch.object(cci, "_exit_stack", mock_exit_stack):
-        # Mock hasattr to return True for Unix functions
-        with mock.patch("builtins.hasattr", return_value=True):
-            # Call the signal handler with SIGTERM
-            cci._signal_handler(signal.SIGTERM, None)
+        # Call the signal handler with SIGTERM
+        cci._signal_handler(signal.SIGTERM, None)
 
-            # Verify console output
-            console_instance.print.assert_any_call(
-                "\n[yellow]Received SIGTERM - CumulusCI is being terminated[/yellow]"
-            )
-            console_instance.print.assert_any_call(
-                "[yellow]Exiting with failure code due to external cancellation.[/yellow]"
-            )
-            console_instance.print.assert_any_call(
-                "[yellow]Terminating child processes...[/yellow]"
-            )
+        # Verify console output
+        console_instance.print.assert_any_call(
+            "\n[yellow]Received SIGTERM - CumulusCI is being terminated[/yellow]"
+        )
+        console_instance.print.assert_any_call(
+            "[yellow]Exiting with failure code due to external cancellation.[/yellow]"
+        )
+        console_instance.print.assert_any_call(
+            "[yellow]Terminating child processes...[/yellow]"
+        )
 
-            # Verify cleanup was called
-            mock_exit_stack.close.assert_called_once()
+        # Verify cleanup was called
+        mock_exit_stack.close.assert_called_once()
 
-            # Verify signal was temporarily ignored and then restored
-            mock_signal.assert_called()
+        # Verify signal was temporarily ignored and then restored
+        mock_signal.assert_called()
 
-            # Verify process group was terminated
-            mock_getpgrp.assert_called_once()
-            mock_killpg.assert_called_once_with(1234, signal.SIGTERM)
+        # Verify process group was terminated
+        mock_getpgrp.assert_called_once()
+        mock_killpg.assert_called_once_with(1234, signal.SIGTERM)
 
-            # Verify exit with correct code
-            mock_exit.assert_called_once_with(143)
+        # Verify exit with correct code
+        mock_exit.assert_called_once_with(143)
 
 
 @mock.patch("sys.exit")
@@ -595,21 +545,19 @@ def test_signal_handler_sigint(
     # Mock the global exit stack
     mock_exit_stack = mock.Mock()
     with mock.patch.object(cci, "_exit_stack", mock_exit_stack):
-        # Mock hasattr to return True for Unix functions
-        with mock.patch("builtins.hasattr", return_value=True):
-            # Call the signal handler with SIGINT
-            cci._signal_handler(signal.SIGINT, None)
+        # Call the signal handler with SIGINT
+        cci._signal_handler(signal.SIGINT, None)
 
-            # Verify console output
-            console_instance.print.assert_any_call(
-                "\n[yellow]Received SIGINT - CumulusCI is being terminated[/yellow]"
-            )
+        # Verify console output
+        console_instance.print.assert_any_call(
+            "\n[yellow]Received SIGINT - CumulusCI is being terminated[/yellow]"
+        )
 
-            # Verify process group was terminated with SIGINT
-            mock_killpg.assert_called_once_with(1234, signal.SIGINT)
+        # Verify process group was terminated with SIGINT
+        mock_killpg.assert_called_once_with(1234, signal.SIGINT)
 
-            # Verify exit with correct code for SIGINT
-            mock_exit.assert_called_once_with(130)
+        # Verify exit with correct code for SIGINT
+        mock_exit.assert_called_once_with(130)
 
 
 @mock.patch("sys.exit")
@@ -643,10 +591,8 @@ def test_signal_handler_handles_killpg_error(
     mock_getpgrp.return_value = 1234
     mock_killpg.side_effect = OSError("Process group not found")
 
-    # Mock hasattr to return True for Unix functions
-    with mock.patch("builtins.hasattr", return_value=True):
-        # Call the signal handler with SIGTERM
-        cci._signal_handler(signal.SIGTERM, None)
+    # Call the signal handler with SIGTERM
+    cci._signal_handler(signal.SIGTERM, None)
 
     # Verify error message was printed
     console_instance.print.assert_any_call(
@@ -659,138 +605,117 @@ def test_signal_handler_handles_killpg_error(
 
 @mock.patch("sys.exit")
 @mock.patch("cumulusci.cli.cci.Console")
-def test_signal_handler_without_process_group_support(mock_console, mock_exit):
+def test_signal_handler_without_process_group_support(
+    mock_console, mock_exit, monkeypatch
+):
     """Test that the signal handler works on Windows where process groups aren't supported"""
     console_instance = mock_console.return_value
 
+    # Remove the Unix-only process group functions (like on Windows)
+    monkeypatch.delattr(os, "getpgrp", raising=False)
+    monkeypatch.delattr(os, "killpg", raising=False)
+
     # Mock the global exit stack
     mock_exit_stack = mock.Mock()
     with mock.patch.object(cci, "_exit_stack", mock_exit_stack):
-        # Mock hasattr to return False for Unix functions (like on Windows)
-        with mock.patch("builtins.hasattr", return_value=False):
-            # Call the signal handler with SIGTERM
-            cci._signal_handler(signal.SIGTERM, None)
-
-            # Verify console output
-            console_instance.print.assert_any_call(
-                "\n[yellow]Received SIGTERM - CumulusCI is being terminated[/yellow]"
-            )
-            console_instance.print.assert_any_call(
-                "[yellow]Exiting with failure code due to external cancellation.[/yellow]"
-            )
-            console_instance.print.assert_any_call(
-                "[yellow]Terminating child processes...[/yellow]"
-            )
-            console_instance.print.assert_any_call(
-                "[yellow]Process group termination not supported on this platform[/yellow]"
-            )
-
-            # Verify cleanup was called
-            mock_exit_stack.close.assert_called_once()
-
-            # Verify exit with correct code
-            mock_exit.assert_called_once_with(143)
+        # Call the signal handler with SIGTERM
+        cci._signal_handler(signal.SIGTERM, None)
+
+        # Verify console output
+        console_instance.print.assert_any_call(
+            "\n[yellow]Received SIGTERM - CumulusCI is being terminated[/yellow]"
+        )
+        console_instance.print.assert_any_call(
+            "[yellow]Exiting with failure code due to external cancellation.[/yellow]"
+        )
+        console_instance.print.assert_any_call(
+            "[yellow]Terminating child processes...[/yellow]"
+        )
+        console_instance.print.assert_any_call(
+            "[yellow]Process group termination not supported on this platform[/yellow]"
+        )
+
+        # Verify cleanup was called
+        mock_exit_stack.close.assert_called_once()
+
+        # Verify exit with correct code
+        mock_exit.assert_called_once_with(143)
+
+
+@pytest.fixture
+def patched_main_deps(patched_cci_main, monkeypatch):
+    """Patch everything cci.main() calls, so only its own setup logic runs"""
+    mocks = patch_cci(
+        monkeypatch, "init_requests_trust", "check_latest_plugins", "set_debug_mode"
+    )
+    patched_cci_main.get_tempfile_logger.return_value = mock.Mock(), "tempfile.log"
+    return SimpleNamespace(**vars(patched_cci_main), **vars(mocks))
 
 
+@mock.patch("cumulusci.cli.cci.signal")
 @mock.patch("os.setpgrp", create=True)
-def test_main_creates_process_group(mock_setpgrp):
+def test_main_creates_process_group(mock_setpgrp, mock_signal, patched_main_deps):
     """Test that main() creates a new process group"""
-    # Mock dependencies to avoid actual CLI execution
-    with mock.patch.multiple(
-        "cumulusci.cli.cci",
-        signal=mock.Mock(),
-        init_requests_trust=mock.Mock(),
-        check_latest_version=mock.Mock(),
-        check_latest_plugins=mock.Mock(),
-        get_tempfile_logger=mock.Mock(return_value=(mock.Mock(), "tempfile.log")),
-        tee_stdout_stderr=mock.Mock(
-            return_value=mock.Mock(__enter__=mock.Mock(), __exit__=mock.Mock())
-        ),
-        set_debug_mode=mock.Mock(
-            return_value=mock.Mock(__enter__=mock.Mock(), __exit__=mock.Mock())
-        ),
-        CliRuntime=mock.Mock(),
-        init_logger=mock.Mock(),
-        cli=mock.Mock(),
-    ):
-        try:
-            cci.main(["cci", "version"])
-        except SystemExit:
-            pass  # Expected for version command
-
-        # Verify process group was created
-        mock_setpgrp.assert_called_once()
+    try:
+        cci.main(["cci", "version"])
+    except SystemExit:
+        pass  # Expected for version command
 
+    # Verify process group was created
+    mock_setpgrp.assert_called_once()
 
+
+@mock.patch("cumulusci.cli.cci.signal")
 @mock.patch("os.setpgrp", create=True)
-def test_main_handles_setpgrp_error(mock_setpgrp):
+def test_main_handles_setpgrp_error(mock_setpgrp, mock_signal, patched_main_deps):
     """Test that main() handles setpgrp errors gracefully"""
     mock_setpgrp.side_effect = OSError("Operation not permitted")
 
-    # Mock dependencies to avoid actual CLI execution
-    with mock.patch.multiple(
-        "cumulusci.cli.cci",
-        signal=mock.Mock(),
-        init_requests_trust=mock.Mock(),
-        check_latest_version=mock.Mock(),
-        check_latest_plugins=mock.Mock(),
-        get_tempfile_logger=mock.Mock(return_value=(mock.Mock(), "tempfile.log")),
-        tee_stdout_stderr=mock.Mock(
-            return_value=mock.Mock(__enter__=mock.Mock(), __exit__=mock.Mock())
-        ),
-        set_debug_mode=mock.Mock(
-            return_value=mock.Mock(__enter__=mock.Mock(), __exit__=mock.Mock())
-        ),
-        CliRuntime=mock.Mock(),
-        init_logger=mock.Mock(),
-        cli=mock.Mock(),
-    ):
-        try:
-            # Should not raise an exception even if setpgrp fails
-            cci.main(["cci", "version"])
-        except SystemExit:
-            pass  # Expected for version command
-        except OSError:
-            pytest.fail("main() should handle setpgrp errors gracefully")
-
-        # Verify setpgrp was attempted
-        mock_setpgrp.assert_called_once()
+    try:
+        # Should not raise an exception even if setpgrp fails
+        cci.main(["cci", "version"])
+    except SystemExit:
+        pass  # Expected for version command
+    except OSError:
+        pytest.fail("main() should handle setpgrp errors gracefully")
+
+    # Verify setpgrp was attempted
+    mock_setpgrp.assert_called_once()
 
 
 @mock.patch("signal.signal")
-def test_main_registers_signal_handlers(mock_signal):
+def test_main_registers_signal_handlers(mock_signal, patched_main_deps):
     """Test that main() registers signal handlers"""
-    # Create a proper context manager mock
-    context_manager_mock = mock.Mock()
-    context_manager_mock.__enter__ = mock.Mock(return_value=context_manager_mock)
-    context_manager_mock.__exit__ = mock.Mock(return_value=None)
-
-    # Create another context manager mock for set_debug_mode
-    debug_context_mock = mock.Mock()
-    debug_context_mock.__enter__ = mock.Mock(return_value=debug_context_mock)
-    debug_context_mock.__exit__ = mock.Mock(return_value=None)
-
-    # Mock dependencies to avoid actual CLI execution
-    with mock.patch.multiple(
-        "cumulusci.cli.cci",
-        init_requests_trust=mock.Mock(),
-        check_latest_version=mock.Mock(),
-        check_latest_plugins=mock.Mock(),
-        get_tempfile_logger=mock.Mock(return_value=(mock.Mock(), "tempfile.log")),
-        tee_stdout_stderr=mock.Mock(return_value=context_manager_mock),
-        set_debug_mode=mock.Mock(return_value=debug_context_mock),
-        CliRuntime=mock.Mock(),
-        init_logger=mock.Mock(),
-        cli=mock.Mock(),
-    ):
-        try:
-            cci.main(["cci", "version"])
-        except SystemExit:
-            pass  # Expected for version command
-
-        # Verify signal handlers were registered
-        expected_calls = [
-            mock.call(signal.SIGTERM, cci._signal_handler),
-            mock.call(signal.SIGINT, cci._signal_handler),
-        ]
-        mock_signal.assert_has_calls(expected_calls, any_order=True)
+    try:
+        cci.main(["cci", "version"])
+    except SystemExit:
+        pass  # Expected for version command
+
+    # Verify signal handlers were registered
+    expected_calls = [
+        mock.call(signal.SIGTERM, cci._signal_handler),
+        mock.call(signal.SIGINT, cci._signal_handler),
+    ]
+    mock_signal.assert_has_calls(expected_calls, any_order=True)
+
+
+@mock.patch("importlib.metadata.version")
+def test_check_conflicting_install(version, monkeypatch):
+    monkeypatch.delenv(cci.SKIP_CONFLICT_CHECK_ENV, raising=False)
+    version.return_value = "3.84.0"
+
+    with pytest.raises(CumulusCIException, match="CumulusCI installation found"):
+        cci._check_conflicting_install()
+    assert cci.SKIP_CONFLICT_CHECK_ENV not in os.environ
+
+
+@mock.patch("importlib.metadata.version")
+def test_check_conflicting_install__not_installed(version, monkeypatch):
+    monkeypatch.delenv(cci.SKIP_CONFLICT_CHECK_ENV, raising=False)
+    version.side_effect = importlib.metadata.PackageNotFoundError("cumulusci")
+
+    cci._check_conflicting_install()
+    assert os.environ[cci.SKIP_CONFLICT_CHECK_ENV] == "True"
+
+    cci._check_conflicting_install()
+    version.assert_called_once_with("cumulusci")
@@ -22,7 +22,7 @@ def test_flow_list(cli_tbl):
     run_click_command(flow.flow_list, runtime=runtime, plain=False, print_json=False)
 
     cli_tbl.assert_called_with(
-        [["Flow", "Description"], ["test_flow", "Test Flow"]],
+        [["Flow", "Description"], ("test_flow", "Test Flow")],
         "Testing",
     )
 
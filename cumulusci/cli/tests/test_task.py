@@ -174,7 +174,7 @@ def test_task_list(cli_tbl):
     run_click_command(task.task_list, runtime=runtime, plain=False, print_json=False)
 
     cli_tbl.assert_called_with(
-        [["Task", "Description"], ["test_task", "Test Task"]], "Test Group"
+        [["Task", "Description"], ("test_task", "Test Task")], "Test Group"
     )
 
 
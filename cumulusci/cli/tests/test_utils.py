@@ -1,4 +1,5 @@
 import json
+import os
 import sys
 import time
 from unittest import mock
@@ -9,6 +10,9 @@ import responses
 from packaging import version
 
 import cumulusci
+from cumulusci.core.config import UniversalConfig
+from cumulusci.plugins import plugin_loader
+from cumulusci.utils.http.requests_utils import get_pypi_session
 
 from .. import utils
 
@@ -18,8 +22,53 @@ def test_get_installed_version():
     assert cumulusci.__version__ == str(result)
 
 
+@pytest.mark.parametrize(
+    "versionstring,expected",
+    [
+        ("1.0.1", True),
+        ("10", True),
+        ("2.0b1", False),
+        ("2.0.dev0", False),
+        ("1.0.post1", False),
+        ("1.0\n", False),
+        ("", False),
+    ],
+)
+def test_is_final_release(versionstring, expected):
+    assert utils.is_final_release(versionstring) is expected
+
+
+def test_group_items():
+    items = [
+        {"name": "deploy", "description": "Deploys", "group": "Salesforce"},
+        {"name": "robot", "description": "Runs tests", "group": None},
+        {"name": "retrieve", "description": "Retrieves", "group": "Salesforce"},
+    ]
+
+    assert utils.group_items(items) == {
+        "Salesforce": [("deploy", "Deploys"), ("retrieve", "Retrieves")],
+        "Other": [("robot", "Runs tests")],
+    }
+
+
+def test_group_items__interns_group_names():
+    items = [
+        {"name": "a", "description": "", "group": "".join(["Sales", "force"])},
+        {"name": "b", "description": "", "group": "".join(["Sales", "force"])},
+    ]
+
+    (group_name,) = utils.group_items(items)
+
+    assert group_name is sys.intern("Salesforce")
+
+
+@pytest.fixture
+def empty_pypi_json_cache(monkeypatch):
+    monkeypatch.setattr(plugin_loader, "_pypi_json_cache", {})
+
+
 @responses.activate
-def test_get_latest_final_version():
+def test_get_latest_final_version(empty_pypi_json_cache):
     responses.add(
         method="GET",
         url="https://pypi.org/pypi/cumulusci-plus/json",
@@ -40,32 +89,275 @@ def test_get_latest_final_version():
     assert result.base_version == "1.0.1"
 
 
+@responses.activate
+def test_get_latest_final_version__no_final_releases(empty_pypi_json_cache):
+    responses.add(
+        method="GET",
+        url="https://pypi.org/pypi/cumulusci-plus/json",
+        body=json.dumps({"releases": {"1.0b1": {}, "1.0.dev0": {}}}),
+        status=200,
+    )
+    result = utils.get_latest_final_version()
+    assert result == version.parse("0")
+
+
+@responses.activate
+def test_get_latest_final_version__tstamp_file(empty_pypi_json_cache):
+    responses.add(
+        method="GET",
+        url="https://pypi.org/pypi/some-plugin/json",
+        json={"releases": {"1.0": {}}},
+    )
+
+    with pytest.deprecated_call():
+        result = utils.get_latest_final_version("some-plugin", "plugin_timestamp")
+    assert result == version.parse("1.0")
+
+
+def test_timestamp_file(tmp_path):
+    with utils.timestamp_file(str(tmp_path)) as f:
+        assert f.read() == ""
+        f.write("1234.5")
+    with utils.timestamp_file(str(tmp_path)) as f:
+        assert f.read() == "1234.5"
+    assert (tmp_path / "cumulus_timestamp").exists()
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="POSIX permissions")
+def test_timestamp_file__respects_umask(tmp_path):
+    old_umask = os.umask(0o022)
+    try:
+        with utils.timestamp_file(str(tmp_path)):
+            pass
+    finally:
+        os.umask(old_umask)
+
+    assert (tmp_path / "cumulus_timestamp").stat().st_mode & 0o777 == 0o644
+
+
+@pytest.fixture
+def no_version_check_refresh():
+    """Overrides the conftest stub: these tests exercise the real refresh"""
+
+
+@pytest.fixture
+def version_check_cache():
+    return os.path.join(
+        UniversalConfig.default_cumulusci_dir(),
+        utils.version_check_cache_file("cumulusci-plus"),
+    )
+
+
+@mock.patch("cumulusci.cli.utils.start_version_check_refresh")
 @mock.patch("cumulusci.cli.utils.get_installed_version")
-@mock.patch("cumulusci.cli.utils.get_latest_final_version")
 @mock.patch("cumulusci.cli.utils.click")
-def test_check_latest_version(click, get_latest_final_version, get_installed_version):
-    with utils.timestamp_file() as f:
-        f.write(str(time.time() - 4000))
-    get_latest_final_version.return_value = version.parse("2")
+def test_check_latest_version(
+    click, get_installed_version, start_refresh, version_check_cache
+):
+    utils.write_version_check_cache(
+        version_check_cache, {"pkg": "cumulusci-plus", "latest": "2"}
+    )
     get_installed_version.return_value = version.parse("1")
 
     utils.check_latest_version()
-    if sys.version_info > utils.LOWEST_SUPPORTED_VERSION:
-        click.echo.assert_called_once()
-    else:
-        click.echo.assert_called()
 
+    start_refresh.assert_not_called()
+    click.echo.assert_called_once()
 
-@mock.patch("cumulusci.cli.utils.get_latest_final_version")
+
+@mock.patch("cumulusci.cli.utils.start_version_check_refresh")
 @mock.patch("cumulusci.cli.utils.click")
-def test_check_latest_version_request_error(click, get_latest_final_version):
-    with utils.timestamp_file() as f:
-        f.write(str(time.time() - 4000))
-    get_latest_final_version.side_effect = requests.exceptions.RequestException()
+def test_check_latest_version__stale_cache(click, start_refresh, version_check_cache):
+    utils.write_version_check_cache(
+        version_check_cache, {"pkg": "cumulusci-plus", "latest": "1"}
+    )
+    checked_at = time.time() - utils.VERSION_CHECK_INTERVAL - 1
+    os.utime(version_check_cache, (checked_at, checked_at))
+
+    utils.check_latest_version()
+
+    start_refresh.assert_called_once_with("cumulusci-plus", version_check_cache)
+    click.echo.assert_not_called()
+
 
+@mock.patch("cumulusci.cli.utils.start_version_check_refresh")
+@mock.patch("cumulusci.cli.utils.click")
+def test_check_latest_version__no_cache(click, start_refresh, version_check_cache):
     utils.check_latest_version()
 
-    click.echo.assert_any_call("Error checking cci version:", err=True)
+    start_refresh.assert_called_once_with("cumulusci-plus", version_check_cache)
+    click.echo.assert_not_called()
+
+
+@mock.patch("cumulusci.cli.utils.start_version_check_refresh")
+@mock.patch("cumulusci.cli.utils.click")
+def test_check_latest_version__plugin_package(
+    click, start_refresh, version_check_cache
+):
+    utils.write_version_check_cache(
+        version_check_cache, {"pkg": "cumulusci-plus", "latest": "5.0.20"}
+    )
+    plugin_cache = os.path.join(
+        UniversalConfig.default_cumulusci_dir(),
+        utils.version_check_cache_file("some-plugin"),
+    )
+
+    utils.check_latest_version(
+        pkg="some-plugin", installed_version=version.parse("1.0.0")
+    )
+
+    start_refresh.assert_called_once_with("some-plugin", plugin_cache)
+    click.echo.assert_not_called()
+
+
+@mock.patch("cumulusci.cli.utils.start_version_check_refresh")
+@mock.patch("cumulusci.cli.utils.click")
+def test_check_latest_version__other_package_in_cache(click, start_refresh):
+    plugin_cache = os.path.join(
+        UniversalConfig.default_cumulusci_dir(), "plugin_timestamp.json"
+    )
+    utils.write_version_check_cache(
+        plugin_cache, {"pkg": "cumulusci-plus", "latest": "5.0.20"}
+    )
+
+    utils.check_latest_version(
+        "some-plugin", version.parse("1.0.0"), "plugin_timestamp"
+    )
+
+    start_refresh.assert_called_once_with("some-plugin", plugin_cache)
+    click.echo.assert_not_called()
+
+
+@mock.patch("cumulusci.cli.utils.start_version_check_refresh")
+@mock.patch("cumulusci.cli.utils.click")
+def test_check_latest_version__tstamp_file(click, start_refresh):
+    plugin_cache = os.path.join(
+        UniversalConfig.default_cumulusci_dir(), "plugin_timestamp.json"
+    )
+    utils.write_version_check_cache(
+        plugin_cache, {"pkg": "some-plugin", "latest": "2.0"}
+    )
+
+    utils.check_latest_version(
+        pkg="some-plugin",
+        installed_version=version.parse("1.0.0"),
+        tstamp_file="plugin_timestamp",
+        message="Update some-plugin",
+    )
+
+    start_refresh.assert_not_called()
+    click.echo.assert_called_once_with("Update some-plugin", err=True)
+
+
+@mock.patch("cumulusci.cli.utils.start_version_check_refresh")
+@mock.patch("cumulusci.cli.utils.click")
+def test_check_latest_version__unsupported_python(click, start_refresh, monkeypatch):
+    monkeypatch.setattr(utils, "LOWEST_SUPPORTED_VERSION", (99, 0, 0))
+
+    utils.check_latest_version()
+
+    start_refresh.assert_not_called()
+    click.echo.assert_called_once()
+    assert "Python version is not supported" in click.echo.call_args.args[0]
+
+
+@responses.activate
+def test_refresh_version_check_cache(version_check_cache):
+    responses.add(
+        method="GET",
+        url="https://pypi.org/pypi/cumulusci-plus/json",
+        json={"releases": {"1.0": {}, "2.0": {}, "3.0b1": {}}},
+        headers={"ETag": '"abc"', "Last-Modified": "Thu, 01 Oct 2026 00:00:00 GMT"},
+    )
+
+    utils.start_version_check_refresh("cumulusci-plus", version_check_cache).join()
+
+    cache = utils.read_version_check_cache(version_check_cache)
+    assert cache["pkg"] == "cumulusci-plus"
+    assert cache["latest"] == "2.0"
+    assert cache["etag"] == '"abc"'
+    assert cache["last_modified"] == "Thu, 01 Oct 2026 00:00:00 GMT"
+    assert "If-None-Match" not in responses.calls[0].request.headers
+
+
+@responses.activate
+def test_refresh_version_check_cache__not_modified(version_check_cache):
+    utils.write_version_check_cache(
+        version_check_cache,
+        {
+            "pkg": "cumulusci-plus",
+            "latest": "2.0",
+            "etag": '"abc"',
+            "last_modified": "Thu, 01 Oct 2026 00:00:00 GMT",
+        },
+    )
+    os.utime(version_check_cache, (0, 0))
+    responses.add(
+        method="GET", url="https://pypi.org/pypi/cumulusci-plus/json", status=304
+    )
+
+    utils.refresh_version_check_cache("cumulusci-plus", version_check_cache)
+
+    request_headers = responses.calls[0].request.headers
+    assert request_headers["If-None-Match"] == '"abc"'
+    assert request_headers["If-Modified-Since"] == "Thu, 01 Oct 2026 00:00:00 GMT"
+    cache = utils.read_version_check_cache(version_check_cache)
+    assert cache["latest"] == "2.0"
+    assert cache["etag"] == '"abc"'
+    assert time.time() - os.stat(version_check_cache).st_mtime < 60
+
+
+@responses.activate
+def test_refresh_version_check_cache__other_package(version_check_cache):
+    utils.write_version_check_cache(
+        version_check_cache,
+        {"pkg": "some-plugin", "latest": "2.0", "etag": '"plugin"'},
+    )
+    responses.add(
+        method="GET",
+        url="https://pypi.org/pypi/cumulusci-plus/json",
+        json={"releases": {"5.0": {}}},
+    )
+
+    utils.refresh_version_check_cache("cumulusci-plus", version_check_cache)
+
+    assert "If-None-Match" not in responses.calls[0].request.headers
+    cache = utils.read_version_check_cache(version_check_cache)
+    assert cache["pkg"] == "cumulusci-plus"
+    assert cache["latest"] == "5.0"
+
+
+@responses.activate
+def test_refresh_version_check_cache__request_error(version_check_cache):
+    responses.add(
+        method="GET",
+        url="https://pypi.org/pypi/cumulusci-plus/json",
+        body=requests.exceptions.ConnectionError(),
+    )
+
+    utils.refresh_version_check_cache("cumulusci-plus", version_check_cache)
+
+    assert utils.read_version_check_cache(version_check_cache) == {}
+
+
+@responses.activate
+def test_refresh_version_check_cache__invalid_version(version_check_cache):
+    responses.add(
+        method="GET",
+        url="https://pypi.org/pypi/cumulusci-plus/json",
+        json={"releases": {"1.0.": {}, "2.0": {}}},
+    )
+
+    utils.refresh_version_check_cache("cumulusci-plus", version_check_cache)
+
+    assert utils.read_version_check_cache(version_check_cache) == {}
+
+
+def test_read_version_check_cache__corrupt(version_check_cache):
+    with open(version_check_cache, "w") as f:
+        f.write("not json")
+
+    assert utils.read_version_check_cache(version_check_cache) == {}
 
 
 @pytest.mark.skipif(
@@ -74,8 +366,10 @@ def test_check_latest_version_request_error(click, get_latest_final_version):
 @mock.patch("winreg.QueryValueEx")
 def test_win32_warning(query_value):
     query_value.return_value = (1, 1)
+    utils.win32_long_paths_enabled.cache_clear()
 
     is_enabled = utils.win32_long_paths_enabled()
+    assert utils.win32_long_paths_enabled() is is_enabled
 
     query_value.assert_called_once()
     assert "LongPathsEnabled" in query_value.call_args.args
@@ -120,3 +414,49 @@ def test_longpath_warn_on_win(console_print, is_enabled):
 
     is_enabled.assert_called_once()
     console_print.assert_called_once_with(utils.WIN_LONG_PATH_WARNING)
+
+
+@mock.patch("cumulusci.cli.utils.click")
+@mock.patch("cumulusci.cli.utils.load_plugins")
+def test_check_latest_plugins(load_plugins, click):
+    plugins = [mock.Mock(), mock.Mock()]
+    plugins[1].name = "broken"
+    plugins[1].check_latest_version.side_effect = Exception("no network")
+    load_plugins.return_value = plugins
+
+    utils.check_latest_plugins()
+
+    for plugin in plugins:
+        plugin.check_latest_version.assert_called_once_with()
+    click.echo.assert_called_once_with(
+        "Error checking latest version for plugin broken: no network", err=True
+    )
+
+
+@mock.patch("cumulusci.cli.utils.ThreadPoolExecutor")
+@mock.patch("cumulusci.cli.utils.load_plugins")
+def test_check_latest_plugins__single_plugin(load_plugins, ThreadPoolExecutor):
+    plugin = mock.Mock()
+    load_plugins.return_value = [plugin]
+
+    utils.check_latest_plugins()
+
+    plugin.check_latest_version.assert_called_once_with()
+    ThreadPoolExecutor.assert_not_called()
+
+
+@mock.patch("cumulusci.cli.utils.ThreadPoolExecutor")
+@mock.patch("cumulusci.cli.utils.load_plugins")
+def test_check_latest_plugins__no_plugins(load_plugins, ThreadPoolExecutor):
+    load_plugins.return_value = []
+
+    utils.check_latest_plugins()
+
+    ThreadPoolExecutor.assert_not_called()
+
+
+def test_get_pypi_session__shared():
+    session = get_pypi_session()
+
+    assert session is get_pypi_session()
+    assert session.get_adapter("https://pypi.org").max_retries.total == 3
@@ -1,21 +1,30 @@
 import contextlib
+import json
 import os
-import re
 import sys
+import threading
 import time
-from collections import defaultdict
-from typing import Optional
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 import click
-import requests
 from packaging import version as packaging_version
-from rich.console import Console
 
 from cumulusci import __version__
 from cumulusci.core.config import UniversalConfig
-from cumulusci.plugins.plugin_loader import load_plugins
+from cumulusci.core.exceptions import CumulusCIException
+from cumulusci.plugins.plugin_loader import get_cached_pypi_json, load_plugins
 from cumulusci.utils import get_cci_upgrade_command
-from cumulusci.utils.http.requests_utils import safe_json_from_response
+from cumulusci.utils.http.requests_utils import (
+    get_pypi_session,
+    pypi_json_url,
+    safe_json_from_response,
+)
+
+if TYPE_CHECKING:
+    from rich.console import Console
 
 LOWEST_SUPPORTED_VERSION = (3, 11, 0)
 WIN_LONG_PATH_WARNING = """
@@ -24,15 +33,20 @@ tasks. Your administrator will need to activate the "Enable Win32 long paths"
 group policy, or set LongPathsEnabled to 1 in the registry key
 HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Control\\FileSystem.
 """
+VERSION_CHECK_INTERVAL = 24 * 60 * 60
+
+_version_check_lock = threading.Lock()
+_version_check_threads: Dict[Tuple[str, str], threading.Thread] = {}
 
 
 def group_items(items):
     """Given a list of dicts with 'group' keys,
-    returns those items in lists categorized group"""
-    groups = defaultdict(list)
+    returns (name, description) tuples in lists categorized by group"""
+    groups = {}
     for item in items:
-        group_name = item["group"] or "Other"
-        groups[group_name].append([item["name"], item["description"]])
+        # Interned so the many rows sharing a group share one key object
+        group_name = sys.intern(item["group"] or "Other")
+        groups.setdefault(group_name, []).append((item["name"], item["description"]))
 
     return groups
 
@@ -41,22 +55,24 @@ def group_items(items):
 def timestamp_file(
     config_dir: Optional[str] = None, timestamp_file: str = "cumulus_timestamp"
 ):
-    """Opens a file for tracking the time of the last version check"""
+    """Opens (creating if needed) a read/write timestamp file in config_dir,
+    such as the commit and download time download_extract keeps in its target
+    directory"""
 
     config_dir = (
         UniversalConfig.default_cumulusci_dir() if config_dir is None else config_dir
     )
     timestamp_file = os.path.join(config_dir, timestamp_file)
 
-    try:
-        with open(timestamp_file, "r+") as f:
-            yield f
-    except IOError:  # file does not exist
-        with open(timestamp_file, "w+") as f:
-            yield f
+    # O_CREAT opens an existing file or creates a new one in a single call;
+    # 0o666 leaves the permissions to the umask, as open() did
+    fd = os.open(timestamp_file, os.O_RDWR | os.O_CREAT, 0o666)
+    with os.fdopen(fd, "r+") as f:
+        yield f
 
 
-FINAL_VERSION_RE = re.compile(r"^[\d\.]+$")
+# Deletes digits and periods; anything left over marks a pre/post/dev release
+FINAL_VERSION_DELETE_TABLE = str.maketrans("", "", "0123456789.")
 
 
 def is_final_release(version: str) -> bool:
@@ -65,62 +81,172 @@ def is_final_release(version: str) -> bool:
     cumulusci versions are considered final if they contain only digits and periods.
     e.g. 1.0.1 is final but 2.0b1 and 2.0.dev0 are not.
     """
-    return bool(FINAL_VERSION_RE.match(version))
+    return bool(version) and not version.translate(FINAL_VERSION_DELETE_TABLE)
+
+
+def latest_final_release(releases) -> packaging_version.Version:
+    """return the highest final version among the release strings"""
+    return max(
+        (
+            packaging_version.parse(versionstring)
+            for versionstring in releases
+            if is_final_release(versionstring)
+        ),
+        default=packaging_version.parse("0"),
+    )
 
 
 def get_latest_final_version(
-    pkg="cumulusci-plus", tstamp_file="cumulus_timestamp"
+    pkg="cumulusci-plus", tstamp_file=None
 ) -> packaging_version.Version:
-    """return the latest version of cumulusci in pypi, be defensive"""
-    # use the pypi json api https://wiki.python.org/moin/PyPIJSON
-    res = safe_json_from_response(
-        requests.get(f"https://pypi.org/pypi/{pkg}/json", timeout=5)
-    )
-    with timestamp_file(timestamp_file=tstamp_file) as f:
-        f.write(str(time.time()))
-    versions = []
-    for versionstring in res["releases"].keys():
-        if not is_final_release(versionstring):
-            continue
-        versions.append(packaging_version.parse(versionstring))
-    versions.sort(reverse=True)
-    return versions[0]
+    """return the latest version of cumulusci in pypi, be defensive
+
+    tstamp_file is accepted for backwards compatibility and ignored; this
+    no longer records when the check happened.
+    """
+    if tstamp_file is not None:
+        warnings.warn(
+            "get_latest_final_version() no longer uses tstamp_file",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    return latest_final_release(get_cached_pypi_json(pkg)["releases"])
+
+
+def version_check_cache_file(pkg: str) -> str:
+    """Name of the file in ~/.cumulusci caching the version check for pkg"""
+    return f"version_check_{pkg}.json"
+
+
+def read_version_check_cache(path: str) -> dict:
+    """Read the result of the last version check, or {} if there isn't one"""
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def write_version_check_cache(path: str, cache: dict) -> None:
+    """Atomically replace the version check cache"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def refresh_version_check_cache(pkg: str, path: str) -> None:
+    """Fetch the latest version of pkg from pypi and cache it at path.
+
+    The request is conditional on the validators from the previous response,
+    so an unchanged release list costs a 304 and a touch of the cache file
+    instead of the full JSON.
+    Runs in a background thread, so failures are left for the next check.
+    """
+    import requests
+
+    cache = read_version_check_cache(path)
+    headers = {}
+    # Validators are only good for the URL they came from
+    if cache.get("pkg") == pkg and cache.get("latest"):
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
+    try:
+        response = get_pypi_session().get(
+            pypi_json_url(pkg), headers=headers, timeout=5
+        )
+        if response.status_code == 304 and headers:
+            # Unchanged, so just mark the cached result as freshly checked
+            os.utime(path)
+            return
+        res = safe_json_from_response(response)
+        cache = {
+            "pkg": pkg,
+            "latest": str(latest_final_release(res["releases"])),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        write_version_check_cache(path, cache)
+    except (
+        requests.exceptions.RequestException,
+        CumulusCIException,
+        LookupError,
+        OSError,
+        ValueError,
+    ):
+        return
+
+
+def start_version_check_refresh(pkg: str, path: str) -> threading.Thread:
+    """Refresh the version check cache in a daemon thread, at most one per
+    package and cache file"""
+    key = (pkg, path)
+    with _version_check_lock:
+        thread = _version_check_threads.get(key)
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(
+                target=refresh_version_check_cache,
+                args=(pkg, path),
+                name=f"version-check-{pkg}",
+                daemon=True,
+            )
+            _version_check_threads[key] = thread
+            thread.start()
+        return thread
 
 
 def check_latest_version(
     pkg="cumulusci-plus",
     installed_version=None,
-    tstamp_file="cumulus_timestamp",
+    tstamp_file=None,
     message=f"""An update to CumulusCI Plus is available. To install the update, run this command: {get_cci_upgrade_command()}""",
+    cache_file=None,
 ):
-    """checks for the latest version of cumulusci from pypi, max once per hour"""
-    check = True
-
-    with timestamp_file(timestamp_file=tstamp_file) as f:
-        timestamp = float(f.read() or 0)
-    delta = time.time() - timestamp
-    check = delta > 3600
-
-    if check:
-        try:
-            latest_version = get_latest_final_version(pkg, tstamp_file)
-        except requests.exceptions.RequestException as e:
-            click.echo("Error checking cci version:", err=True)
-            click.echo(str(e), err=True)
-            return
-
-        result = latest_version > (installed_version or get_installed_version())
-        if result:
-            click.echo(
-                message,
-                err=True,
-            )
+    """checks for the latest version of pkg from pypi, max once per day
 
-        if sys.version_info < LOWEST_SUPPORTED_VERSION:
-            click.echo(
-                "Sorry! Your Python version is not supported. Please upgrade to Python 3.11.",
-                err=True,
-            )
+    This never waits on the network: it compares against the result of the
+    previous check and refreshes a stale result in the background.
+    Each package gets its own cache file; callers that still pass the
+    tstamp_file they used to track their check get "<tstamp_file>.json".
+    """
+    if sys.version_info < LOWEST_SUPPORTED_VERSION:
+        click.echo(
+            "Sorry! Your Python version is not supported. Please upgrade to Python 3.11.",
+            err=True,
+        )
+        return
+
+    if cache_file is None:
+        cache_file = (
+            f"{tstamp_file}.json" if tstamp_file else version_check_cache_file(pkg)
+        )
+    path = os.path.join(UniversalConfig.default_cumulusci_dir(), cache_file)
+    # The cache file's mtime records when PyPI was last checked
+    try:
+        checked_at = os.stat(path).st_mtime
+    except FileNotFoundError:
+        start_version_check_refresh(pkg, path)
+        return
+    cache = read_version_check_cache(path)
+    if cache.get("pkg") != pkg:
+        # Written for some other package, so it says nothing about this one
+        start_version_check_refresh(pkg, path)
+        return
+    if time.time() - checked_at > VERSION_CHECK_INTERVAL:
+        start_version_check_refresh(pkg, path)
+
+    latest_version = cache.get("latest")
+    if latest_version and parse_version(latest_version) > (
+        installed_version or get_installed_version()
+    ):
+        click.echo(
+            message,
+            err=True,
+        )
 
 
 def parse_version(versionstring: str) -> packaging_version.Version:
@@ -133,11 +259,13 @@ def get_installed_version() -> packaging_version.Version:
     return parse_version(__version__)
 
 
+@cache
 def win32_long_paths_enabled() -> bool:
     """Boolean indicating whether long paths are available on Windows systems.
 
     Reads the Windows Registry the running platform. Throws ModuleNotFoundError
-    if run on non-Windows platforms.
+    if run on non-Windows platforms. The setting can't change while we run,
+    so the registry is only read once.
     """
     # Only present on windows, so import it here instead
     import winreg
@@ -152,18 +280,32 @@ def win32_long_paths_enabled() -> bool:
     return is_enabled == 1
 
 
-def warn_if_no_long_paths(console: Console = Console()) -> None:
+def warn_if_no_long_paths(console: Optional["Console"] = None) -> None:
     """Print a warning to the user if long paths are not enabled."""
     if sys.platform.startswith("win") and not win32_long_paths_enabled():
+        if console is None:
+            from rich.console import Console
+
+            console = Console()
         console.print(WIN_LONG_PATH_WARNING)
 
 
+def _check_plugin_version(plugin) -> None:
+    try:
+        plugin.check_latest_version()
+    except Exception as e:
+        click.echo(
+            f"Error checking latest version for plugin {plugin.name}: {e}", err=True
+        )
+
+
 def check_latest_plugins():
+    """Run each plugin's version check, concurrently since they may hit the network"""
     plugins = load_plugins()
-    for plugin in plugins:
-        try:
-            plugin.check_latest_version()
-        except Exception as e:
-            click.echo(
-                f"Error checking latest version for plugin {plugin.name}: {e}", err=True
-            )
+    if len(plugins) < 2:
+        # Nothing to overlap, so don't pay for a thread pool
+        for plugin in plugins:
+            _check_plugin_version(plugin)
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(plugins))) as executor:
+        list(executor.map(_check_plugin_version, plugins))
@@ -111,6 +111,14 @@ def patch_home_and_env(request):
             yield
 
 
+@pytest.fixture(autouse=True)
+def no_version_check_refresh():
+    """Keep tests that run cci.main() from refreshing the PyPI version cache in a
+    background thread, which would outlive the fake home directory."""
+    with mock.patch("cumulusci.cli.utils.start_version_check_refresh"):
+        yield
+
+
 @pytest.fixture()
 def temp_db():
     with TemporaryDirectory() as t:
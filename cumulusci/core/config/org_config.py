@@ -18,6 +18,7 @@ from cumulusci.core.exceptions import (
 )
 from cumulusci.oauth.client import OAuth2Client, OAuth2ClientConfig
 from cumulusci.oauth.salesforce import SANDBOX_LOGIN_URL, jwt_session
+from cumulusci.salesforce_api.utils import patch_simple_salesforce
 from cumulusci.utils import parse_api_datetime
 from cumulusci.utils.fileutils import open_fs_resource
 from cumulusci.utils.http.requests_utils import safe_json_from_response
@@ -166,6 +167,7 @@ class OrgConfig(BaseConfig):
     def salesforce_client(self):
         """Return a simple_salesforce.Salesforce instance authorized to this org.
         Does not perform a token refresh."""
+        patch_simple_salesforce()
         return Salesforce(
             instance=self.instance_url.replace("https://", ""),
             session_id=self.access_token,
@@ -6,7 +6,6 @@ import pytest
 
 import cumulusci
 from cumulusci.cli import cci
-from cumulusci.cli.tests.test_cci import MagicMock
 from cumulusci.core.config import FlowConfig, OrgConfig
 from cumulusci.core.config.project_config import BaseProjectConfig
 from cumulusci.core.exceptions import (
@@ -770,12 +769,12 @@ def include_fake_project(self: BaseProjectConfig, _spec) -> BaseProjectConfig:
 # fixed centrally!
 @mock.patch(
     "cumulusci.cli.runtime.CliRuntime.get_org",
-    lambda *args, **kwargs: (MagicMock(), MagicMock()),
+    lambda *args, **kwargs: (mock.MagicMock(), mock.MagicMock()),
 )
-@mock.patch("cumulusci.core.runtime.BaseCumulusCI._load_keychain", MagicMock())
-@mock.patch("pdb.post_mortem", MagicMock())
-@mock.patch("cumulusci.cli.cci.tee_stdout_stderr", MagicMock())
-@mock.patch("cumulusci.cli.cci.init_logger", MagicMock())
+@mock.patch("cumulusci.core.runtime.BaseCumulusCI._load_keychain", mock.MagicMock())
+@mock.patch("pdb.post_mortem", mock.MagicMock())
+@mock.patch("cumulusci.cli.cci.tee_stdout_stderr", mock.MagicMock())
+@mock.patch("cumulusci.cli.cci.init_logger", mock.MagicMock())
 @mock.patch("cumulusci.cli.cci.get_tempfile_logger")
 def test_cross_project_tasks(get_tempfile_logger):
     # get_tempfile_logger doesn't clean up after itself which breaks other tests
@@ -245,6 +245,29 @@ class TestDeepMergePlugins:
         # Original should remain unchanged
         assert project_plugins["plugin2"]["nested"]["setting"] == "project_value"
 
+    def test_deep_merge_plugins_disjoint_keys(self):
+        """Test that disjoint plugins are combined without sharing project data"""
+        remote_plugins = {"plugin1": {"setting": "remote_value"}}
+        project_plugins = {"plugin2": {"nested": {"setting": "project_value"}}}
+
+        result = utils.deep_merge_plugins(remote_plugins, project_plugins)
+
+        assert list(result) == ["plugin1", "plugin2"]
+        assert result["plugin2"] == project_plugins["plugin2"]
+        assert result["plugin2"]["nested"] is not project_plugins["plugin2"]["nested"]
+
+    def test_deep_merge_plugins_copies_lists(self):
+        """Test that lists from project plugins are copied, not shared"""
+        remote_plugins = {}
+        project_plugins = {"plugin1": {"paths": [{"path": "src"}]}}
+
+        result = utils.deep_merge_plugins(remote_plugins, project_plugins)
+
+        result["plugin1"]["paths"][0]["path"] = "force-app"
+        result["plugin1"]["paths"].append({"path": "unpackaged"})
+
+        assert project_plugins == {"plugin1": {"paths": [{"path": "src"}]}}
+
     def test_deep_merge_plugins_empty_inputs(self):
         """Test with empty dictionaries"""
         # Empty remote, non-empty project
@@ -402,6 +402,17 @@ def determine_managed_mode(options, project_config, org_config):
         return bool(namespace) and namespace in installed_packages
 
 
+def _copy_plugin_config(value):
+    """Copy the dicts and lists of a plugin config tree; leaves are YAML scalars,
+    which are immutable, so this is a deep copy without deepcopy's memo overhead.
+    """
+    if isinstance(value, dict):
+        return {key: _copy_plugin_config(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_plugin_config(item) for item in value]
+    return value
+
+
 def deep_merge_plugins(remote_plugins, project_plugins):
     """
     Deep merge project_plugins into remote_plugins, adding only missing keys.
@@ -410,12 +421,16 @@ def deep_merge_plugins(remote_plugins, project_plugins):
     if not isinstance(remote_plugins, dict) or not isinstance(project_plugins, dict):
         return remote_plugins
 
+    if remote_plugins.keys().isdisjoint(project_plugins):
+        # Nothing to merge recursively, the usual case for separate plugins
+        return {**remote_plugins, **_copy_plugin_config(project_plugins)}
+
     result = remote_plugins.copy()
 
     for key, value in project_plugins.items():
         if key not in result:
             # Key doesn't exist in remote, add it from project
-            result[key] = copy.deepcopy(value)
+            result[key] = _copy_plugin_config(value)
         elif isinstance(result[key], dict) and isinstance(value, dict):
             # Both are dictionaries, recursively merge
             result[key] = deep_merge_plugins(result[key], value)
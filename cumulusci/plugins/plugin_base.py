@@ -93,6 +93,10 @@ class PluginBase(ABC):
         pass
 
     def check_latest_version(self):
-        """Override this method to check for the latest version of the plugin."""
+        """Override this method to check for the latest version of the plugin.
+
+        Use cumulusci.plugins.plugin_loader.get_cached_pypi_json to look up a
+        package on PyPI so the response is shared with other plugins.
+        """
         # Implement logic to check for the latest version if needed
         pass
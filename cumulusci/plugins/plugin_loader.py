@@ -1,21 +1,68 @@
 import importlib.metadata
 import logging
-from functools import lru_cache
-from typing import Dict, List, Optional, Type
+import threading
+import time
+from functools import cache
+from typing import Dict, List, Optional, Tuple, Type
 
 from cumulusci.plugins.plugin_base import PluginBase
+from cumulusci.utils.http.requests_utils import (
+    get_pypi_session,
+    pypi_json_url,
+    safe_json_from_response,
+)
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+_MANAGER: Optional["PluginManager"] = None
+_PLUGINS: Optional[List[PluginBase]] = None
+
+_pypi_json_cache: Dict[str, Tuple[float, dict]] = {}
+_pypi_json_locks: Dict[str, threading.Lock] = {}
+_pypi_json_locks_lock = threading.Lock()
+
+
+@cache
+def _discover_plugin_entry_points() -> Tuple[importlib.metadata.EntryPoint, ...]:
+    """Scan installed distributions for cumulusci.plugins entry points, once."""
+    return tuple(importlib.metadata.entry_points().select(group="cumulusci.plugins"))
+
+
+def get_cached_pypi_json(pkg: str, ttl: float = 3600) -> dict:
+    """Get the PyPI JSON metadata for pkg, shared across plugins and cci.
+
+    Each package is fetched at most once per ttl seconds per process, even when
+    several plugins check it concurrently. Treat the result as read-only.
+    """
+    with _pypi_json_locks_lock:
+        lock = _pypi_json_locks.setdefault(pkg, threading.Lock())
+    with lock:
+        cached = _pypi_json_cache.get(pkg)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        res = safe_json_from_response(
+            get_pypi_session().get(pypi_json_url(pkg), timeout=5)
+        )
+        _pypi_json_cache[pkg] = (time.monotonic(), res)
+        return res
+
 
 def get_plugin_manager() -> "PluginManager":
-    """Get the plugin manager instance."""
-    return PluginManager()
+    """Get the plugin manager instance, creating it on first use."""
+    global _MANAGER
+    if _MANAGER is None:
+        _MANAGER = PluginManager()
+    return _MANAGER
 
 
-@lru_cache(maxsize=50)
 def load_plugins() -> List[PluginBase]:
-    """Load all available plugins and return them as a list."""
+    """Load all available plugins and return them as a list.
+
+    Plugins are initialized once per process; later calls return the same list.
+    """
+    global _PLUGINS
+    if _PLUGINS is not None:
+        return _PLUGINS
     manager = get_plugin_manager()
     plugins = []
     for name, plugin_class in manager._plugins.items():
@@ -25,6 +72,7 @@ def load_plugins() -> List[PluginBase]:
             plugins.append(plugin)
         except Exception as e:
             logger.warning(f"Failed to initialize plugin {name}: {str(e)}")
+    _PLUGINS = plugins
     return plugins
 
 
@@ -39,9 +87,7 @@ class PluginManager:
     def _load_plugins(self) -> None:
         """Load all available plugins."""
         try:
-            for entry_point in importlib.metadata.entry_points().select(
-                group="cumulusci.plugins"
-            ):
+            for entry_point in _discover_plugin_entry_points():
                 try:
                     plugin_class = entry_point.load()
                     self._plugins[entry_point.name] = plugin_class
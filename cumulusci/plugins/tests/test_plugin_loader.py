@@ -0,0 +1,75 @@
+from unittest import mock
+
+import pytest
+import responses
+
+from cumulusci.plugins import plugin_loader
+
+
+@pytest.fixture
+def fresh_loader():
+    saved = plugin_loader._MANAGER, plugin_loader._PLUGINS
+    plugin_loader._MANAGER = plugin_loader._PLUGINS = None
+    yield
+    plugin_loader._MANAGER, plugin_loader._PLUGINS = saved
+
+
+def test_get_plugin_manager__cached(fresh_loader):
+    with mock.patch.object(plugin_loader, "PluginManager") as PluginManager:
+        manager = plugin_loader.get_plugin_manager()
+
+        assert plugin_loader.get_plugin_manager() is manager
+    PluginManager.assert_called_once_with()
+
+
+def test_load_plugins__cached(fresh_loader):
+    plugin_class = mock.Mock()
+    broken_class = mock.Mock(side_effect=Exception("boom"))
+    manager = mock.Mock(_plugins={"good": plugin_class, "broken": broken_class})
+
+    with mock.patch.object(plugin_loader, "get_plugin_manager", return_value=manager):
+        plugins = plugin_loader.load_plugins()
+
+        assert plugins == [plugin_class.return_value]
+        assert plugin_loader.load_plugins() is plugins
+    plugin_class.assert_called_once_with()
+    plugin_class.return_value.initialize.assert_called_once_with()
+
+
+def test_plugin_manager__entry_points_scanned_once():
+    entry_point = mock.Mock()
+    entry_point.name = "example"
+    plugin_loader._discover_plugin_entry_points.cache_clear()
+    try:
+        with mock.patch("importlib.metadata.entry_points") as entry_points:
+            entry_points.return_value.select.return_value = [entry_point]
+
+            first = plugin_loader.PluginManager()
+            second = plugin_loader.PluginManager()
+
+        entry_points.assert_called_once_with()
+        entry_points.return_value.select.assert_called_once_with(
+            group="cumulusci.plugins"
+        )
+        assert first.list_plugins() == second.list_plugins() == ["example"]
+        assert first.get_plugin("example") is entry_point.load.return_value
+    finally:
+        plugin_loader._discover_plugin_entry_points.cache_clear()
+
+
+@responses.activate
+def test_get_cached_pypi_json(monkeypatch):
+    monkeypatch.setattr(plugin_loader, "_pypi_json_cache", {})
+    responses.add(
+        method="GET",
+        url="https://pypi.org/pypi/example-plugin/json",
+        json={"releases": {"1.0": {}}},
+    )
+
+    first = plugin_loader.get_cached_pypi_json("example-plugin")
+    second = plugin_loader.get_cached_pypi_json("example-plugin")
+    assert first == second == {"releases": {"1.0": {}}}
+    assert len(responses.calls) == 1
+
+    plugin_loader.get_cached_pypi_json("example-plugin", ttl=0)
+    assert len(responses.calls) == 2
@@ -2,11 +2,15 @@ from json import JSONDecodeError
 from unittest.mock import Mock
 
 import pytest
+import simple_salesforce
 
 from cumulusci import __version__
 from cumulusci.core.config import OrgConfig
 from cumulusci.core.exceptions import ServiceNotConfigured
-from cumulusci.salesforce_api.utils import get_simple_salesforce_connection
+from cumulusci.salesforce_api.utils import (
+    get_simple_salesforce_connection,
+    patch_simple_salesforce,
+)
 
 
 def test_connection():
@@ -29,6 +33,16 @@ def test_connection():
     assert sf.headers["Sforce-Call-Options"] == "client=TEST"
 
 
+def test_patch_simple_salesforce(monkeypatch):
+    monkeypatch.setattr(simple_salesforce.api, "OrderedDict", None)
+    monkeypatch.setattr(simple_salesforce.bulk, "OrderedDict", None)
+
+    patch_simple_salesforce()
+
+    assert simple_salesforce.api.OrderedDict is dict
+    assert simple_salesforce.bulk.OrderedDict is dict
+
+
 def test_connection__explicit_api_version():
     org_config = OrgConfig(
         {
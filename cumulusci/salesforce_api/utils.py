@@ -10,6 +10,16 @@ from cumulusci.core.exceptions import ServiceNotConfigured, ServiceNotValid
 CALL_OPTS_HEADER_KEY = "Sforce-Call-Options"
 
 
+def patch_simple_salesforce():
+    """Make simple_salesforce parse JSON responses into plain dicts.
+
+    Done on first client construction rather than when cumulusci is
+    imported, so commands that never talk to Salesforce don't pay for it.
+    """
+    simple_salesforce.api.OrderedDict = dict
+    simple_salesforce.bulk.OrderedDict = dict
+
+
 def get_simple_salesforce_connection(
     project_config, org_config, api_version=None, base_url: str = None
 ):
@@ -27,6 +37,7 @@ def get_simple_salesforce_connection(
     if port:
         instance = f"{instance}:{port}"
 
+    patch_simple_salesforce()
     sf = simple_salesforce.Salesforce(
         instance=instance,
         session_id=org_config.access_token,
@@ -18,7 +18,7 @@ class RetrieveTasks(BaseTask):
         runtime = CliRuntime(load_keychain=True)
         tasks = runtime.get_available_tasks()
         task_groups = group_items(tasks)
-        task_groups = task_groups[self.options["group_name"]]
+        task_groups = task_groups.get(self.options["group_name"], [])
         self.return_values: List[str] = []
         for task_name, description in task_groups:
             self.return_values.append(task_name)
@@ -1,5 +1,6 @@
 import os
 import urllib.request
+import warnings
 import webbrowser
 from contextlib import contextmanager
 from io import StringIO, TextIOWrapper
@@ -7,8 +8,13 @@ from pathlib import Path
 from typing import IO, ContextManager, Text, Tuple, Union
 
 import requests
-from fs import base, copy, open_fs
-from fs import path as fspath
+
+with warnings.catch_warnings():
+    # fs declares its namespace packages through the deprecated pkg_resources
+    # API; silence that here rather than installing a process-wide filter.
+    warnings.filterwarnings("ignore", message=".*pkg_resources.*", category=UserWarning)
+    from fs import base, copy, open_fs
+    from fs import path as fspath
 
 """Utilities for working with files"""
 
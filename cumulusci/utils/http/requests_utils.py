@@ -2,6 +2,7 @@ import os
 import subprocess
 import sys
 import typing as T
+from functools import cache
 from json import JSONDecodeError
 
 from cumulusci.core.exceptions import CumulusCIException
@@ -17,6 +18,32 @@ def safe_json_from_response(response):
         raise CumulusCIException(f"Cannot decode as JSON:  {response.text}")
 
 
+@cache
+def get_pypi_session():
+    """Shared session for PyPI JSON API calls, so repeated version checks
+    (ours and plugins') reuse pooled connections instead of a new TLS handshake.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from requests.packages.urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        ),
+    )
+    return session
+
+
+def pypi_json_url(pkg: str) -> str:
+    # use the pypi json api https://wiki.python.org/moin/PyPIJSON
+    return f"https://pypi.org/pypi/{pkg}/json"
+
+
 is_trust_patched = False
 
 
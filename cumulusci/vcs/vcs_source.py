@@ -3,11 +3,10 @@ import shutil
 from abc import ABC, abstractmethod
 from typing import Type
 
-import fs
-
 from cumulusci.core.exceptions import DependencyResolutionError, VcsNotFoundError
 from cumulusci.core.utils import import_global
 from cumulusci.utils import download_extract_vcs_from_repo
+from cumulusci.utils.fileutils import fspath
 from cumulusci.utils.yaml.cumulusci_yml import VCSSourceModel, VCSSourceRelease
 
 # To avoid circular dependency error
@@ -238,7 +237,7 @@ class VCSSource(ABC):
     def fetch(self):
         """Fetch the archive of the specified commit and construct its project config."""
         with self.project_config.open_cache(
-            fs.path.join("projects", self.repo.repo_name, self.commit)
+            fspath.join("projects", self.repo.repo_name, self.commit)
         ) as path:
             zf = download_extract_vcs_from_repo(self.repo, ref=self.commit)
             try: